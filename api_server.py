@@ -1,37 +1,104 @@
 import asyncio
-import json
+import hmac
+import io
+import logging
+import os
 import time
+import tomllib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Union
 
-import toml
+import msgspec
+import orjson
 from agno.agent import Agent
 from agno.models.deepseek import DeepSeek
-from fastapi import FastAPI, HTTPException, Header
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 
 # 复用 agent.py 中的工具和配置
 from agent import SYSTEM_PROMPT, get_repo_readme, get_user_starred, search_repositories
 
-# 加载配置
-config = toml.load("config.toml")
+# ===== 配置 =====
+
+
+@dataclass(frozen=True, slots=True)
+class AppConfig:
+    api_key: str
+    host: str
+    port: int
+    reload: bool
+    workers: int
+    max_concurrency: int
+    max_queue: int
+    max_n: int
+    breaker_threshold: int
+    breaker_cooldown: float
+    deepseek_model: str
+    deepseek_api_key: str
+    deepseek_base_url: str
+
+
+def load_config(path: str = "config.toml") -> AppConfig:
+    """加载配置文件, 启动时解析一次"""
+    with open(path, "rb") as f:
+        config = tomllib.load(f)
+
+    api = config.get("api", {})
+    app_cfg = config["app"]
+
+    return AppConfig(
+        api_key=api.get("api_key", ""),
+        host=api.get("host", "0.0.0.0"),
+        port=api.get("port", 7777),
+        reload=api.get("reload", False),  # 仅开发环境开启
+        workers=api.get("workers", os.cpu_count() or 1),
+        max_concurrency=api.get("max_concurrency", 16),  # 每个 worker 同时执行的 Agent 数
+        max_queue=api.get("max_queue", 64),  # 槽位占满时允许排队的执行数, 超出返回 429
+        max_n=api.get("max_n", api.get("max_concurrency", 16)),  # 单个请求的 n 上限
+        breaker_threshold=api.get("breaker_threshold", 5),  # 连续失败多少次后熔断
+        breaker_cooldown=api.get("breaker_cooldown", 30.0),  # 熔断后多少秒再放行探测请求
+        deepseek_model=app_cfg.get("deepseek_model", "deepseek-chat"),
+        deepseek_api_key=app_cfg["deepseek_api_key"],
+        deepseek_base_url=app_cfg.get("deepseek_base_url", "https://api.deepseek.com/v1"),
+    )
+
+
+CFG = load_config()
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """启动时预热 Agent 和模型客户端, 避免首个请求承担冷启动开销"""
+    start = time.perf_counter()
+    get_agent(False)
+    deepseek_model.get_async_client()
+    logger.info("Agent warmed up in %.1fms", (time.perf_counter() - start) * 1000)
+
+    yield
+
 
 app = FastAPI(
     title="GitHubHunt API",
     description="OpenAI-compatible API for GitHub repository search using AI Agent",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 
-# ===== Pydantic 模型定义 =====
+# ===== 请求模型定义 (msgspec) =====
 
 
-class Message(BaseModel):
+class Message(msgspec.Struct):
     role: str
     content: Union[str, list]  # 支持字符串或多模态（但后续会拒绝多模态）
 
 
-class ChatCompletionRequest(BaseModel):
+class ChatCompletionRequest(msgspec.Struct):
+    # msgspec 默认忽略未知字段, 等价于宽松解析
     model: str
     messages: list[Message]
     temperature: Optional[float] = 0.7
@@ -42,49 +109,72 @@ class ChatCompletionRequest(BaseModel):
     presence_penalty: Optional[float] = 0.0
     frequency_penalty: Optional[float] = 0.0
 
-    class Config:
-        extra = "allow"  # 宽松解析，允许额外字段
 
+_request_decoder = msgspec.json.Decoder(ChatCompletionRequest)
 
-class ModelInfo(BaseModel):
-    id: str
-    object: str = "model"
-    created: int = int(time.time())
-    owned_by: str = "githubhunt"
 
+# ===== 静态响应 =====
 
-class ModelsResponse(BaseModel):
-    object: str = "list"
-    data: list[ModelInfo]
+# 内容在进程生命周期内不变, 启动时序列化一次, 每次请求直接返回
+_STARTED_AT = int(time.time())
+
+_HEALTH_JSON = orjson.dumps({"status": "ok", "service": "githubhunt-api", "version": "1.0.0"})
+
+_MODELS_JSON = orjson.dumps(
+    {
+        "object": "list",
+        "data": [
+            {
+                "id": "githubhunt-agent",
+                "object": "model",
+                "created": _STARTED_AT,
+                "owned_by": "githubhunt",
+            },
+            {
+                "id": CFG.deepseek_model,
+                "object": "model",
+                "created": _STARTED_AT,
+                "owned_by": "deepseek",
+            },
+        ],
+    }
+)
 
 
 # ===== 鉴权 =====
 
+# 预先编码完整的 Authorization 头, 未配置 api_key 时为 None
+_EXPECTED_HEADER = ("Bearer " + CFG.api_key).encode() if CFG.api_key else None
+
 
 async def verify_api_key(authorization: Optional[str] = Header(None)):
     """验证 API Key"""
-    expected_key = config.get("api", {}).get("api_key", "")
-
-    if not expected_key:
+    if _EXPECTED_HEADER is None:
         # 如果没有配置 api_key，则不进行验证
         return
 
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid Authorization header format")
-
-    token = authorization.replace("Bearer ", "")
-    if token != expected_key:
+    # 整体常量时间比较, 避免计时侧信道
+    if not hmac.compare_digest(authorization.encode(), _EXPECTED_HEADER):
         raise HTTPException(status_code=401, detail="Invalid API key")
 
 
 # ===== Agent 创建 =====
 
+# DeepSeek 模型对象在所有 Agent 之间共享, 避免每次请求重复构造
+deepseek_model = DeepSeek(
+    id=CFG.deepseek_model,
+    api_key=CFG.deepseek_api_key,
+    base_url=CFG.deepseek_base_url,
+    default_headers={"User-Agent": "curl/7.74.0"},  # CF 绕过
+)
+
 
 def create_agent(enable_visual: bool = False) -> Agent:
     """创建 GitHub Agent 实例"""
+    # 同步工具由 agno 在 arun 中通过 asyncio.to_thread 执行, 不会阻塞事件循环
     tools = [search_repositories, get_user_starred, get_repo_readme]
 
     # 视觉分析暂不支持（Phase 1）
@@ -95,18 +185,24 @@ def create_agent(enable_visual: bool = False) -> Agent:
     return Agent(
         name="Github Agent",
         instructions=SYSTEM_PROMPT,
-        model=DeepSeek(
-            id=config["app"].get("deepseek_model", "deepseek-chat"),
-            api_key=config["app"]["deepseek_api_key"],
-            base_url=config["app"].get("deepseek_base_url", "https://api.deepseek.com/v1"),
-            default_headers={"User-Agent": "curl/7.74.0"},  # CF 绕过
-        ),
+        model=deepseek_model,
         markdown=True,
         tools=tools,
         debug_mode=False,
     )
 
 
+@lru_cache(maxsize=4)
+def get_agent(enable_visual: bool = False) -> Agent:
+    """
+    获取缓存的 Agent 实例
+
+    agno 2.x 的运行状态保存在每次 run 的上下文中, Agent 本身可被并发复用,
+    因此按配置缓存, 不必每个请求重新创建
+    """
+    return create_agent(enable_visual)
+
+
 # ===== 消息处理 =====
 
 
@@ -115,13 +211,12 @@ def messages_to_query(messages: list[Message]) -> str:
     将 OpenAI 消息格式转换为 Agent query
     Phase 1: 简单策略，只取最后一条 user 消息
     """
-    user_messages = [m for m in messages if m.role == "user"]
+    # 从后往前找, 命中即停止
+    last_message = next((m for m in reversed(messages) if m.role == "user"), None)
 
-    if not user_messages:
+    if last_message is None:
         raise HTTPException(status_code=400, detail="No user message found in conversation")
 
-    last_message = user_messages[-1]
-
     # 检查是否为多模态输入
     if isinstance(last_message.content, list):
         raise HTTPException(
@@ -134,84 +229,285 @@ def messages_to_query(messages: list[Message]) -> str:
 
 # ===== Agent 执行 =====
 
+# SSE 帧直接以 bytes 产出, StreamingResponse 无需再逐帧编码
+_SSE_DATA = b"data: "
+_SSE_END = b"\n\n"
+_SSE_DONE = _SSE_DATA + b"[DONE]" + _SSE_END
+
+# 流式输出合并阈值: 累积到一定字符数或等待超过时间窗口后才发送一帧
+STREAM_BATCH_CHARS = 64
+STREAM_BATCH_DELAY = 0.005
+
+
+# ===== 并发控制 =====
+
+_AGENT_SEM = asyncio.Semaphore(CFG.max_concurrency)
+_agent_running = 0  # 已持有槽位的执行数
+_agent_reserved = 0  # 已通过准入、尚未拿到槽位的执行数
 
-async def run_agent_sync(agent: Agent, query: str) -> str:
+
+class Reservation:
+    """check_admission 预留的执行名额, 每次拿到槽位消耗一个, 其余在 release() 时归还"""
+
+    __slots__ = ("remaining",)
+
+    def __init__(self, n: int):
+        self.remaining = n
+
+    def consume(self):
+        global _agent_reserved
+        self.remaining -= 1
+        _agent_reserved -= 1
+
+    def release(self):
+        """归还未消耗的名额, 可重复调用"""
+        global _agent_reserved
+        _agent_reserved -= self.remaining
+        self.remaining = 0
+
+
+def check_admission(n: int = 1) -> Reservation:
     """
-    执行 Agent 并收集完整输出（非流式）
+    准入控制: 执行中、排队中加上本请求的 n 次执行超过槽位与队列总容量时直接拒绝
 
-    注意: agno 的 Agent.arun() 返回异步生成器
-    需要收集所有 chunk 并合并
+    检查与预留之间没有 await, 同时到达的请求不会看到过期的计数
+    """
+    global _agent_reserved
+
+    if _agent_running + _agent_reserved + n > CFG.max_concurrency + CFG.max_queue:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many concurrent requests, please retry later",
+            headers={"Retry-After": "1"},
+        )
+
+    _agent_reserved += n
+    return Reservation(n)
+
+
+@asynccontextmanager
+async def agent_slot(reservation: Reservation):
+    """消耗一个预留名额并占用一个 Agent 执行槽位, 限制同时进行的 LLM 调用数量"""
+    global _agent_running
+
+    # 等待期间被取消时名额仍保留在 reservation 中, 由持有者 release() 归还
+    await _AGENT_SEM.acquire()
+    reservation.consume()
+
+    _agent_running += 1
+    try:
+        yield
+    finally:
+        _agent_running -= 1
+        _AGENT_SEM.release()
+
+
+class ReservedStreamingResponse(StreamingResponse):
+    """
+    响应结束时归还预留名额的 StreamingResponse
+
+    客户端在生成器开始迭代前断开时, 生成器的 finally 不会执行, 需在这里兜底
     """
-    response_parts = []
 
+    def __init__(self, *args, reservation: Reservation, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reservation = reservation
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.reservation.release()
+
+
+# ===== 熔断 =====
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Agent 调用熔断器
+
+    连续失败达到阈值后进入 open 状态, 冷却期内的请求直接返回 503;
+    冷却结束后放行一个探测请求 (half_open), 成功则恢复, 失败则重新计时;
+    结果按请求记录, 而不是按单次 Agent 执行
+    """
+
+    threshold: int
+    cooldown: float
+    fail_count: int = 0
+    opened_at: float = 0.0
+    state: str = "closed"  # closed | open | half_open
+
+    def check(self):
+        """请求进入前检查, 熔断期间抛出 503"""
+        if self.state == "closed":
+            return
+
+        elapsed = time.monotonic() - self.opened_at
+        if elapsed >= self.cooldown:
+            # 放行一个探测请求; 若探测迟迟没有结果, 下一个冷却周期再放行一个
+            self.state = "half_open"
+            self.opened_at = time.monotonic()
+            return
+
+        raise HTTPException(
+            status_code=503,
+            detail="Upstream model is unavailable, please retry later",
+            headers={"Retry-After": str(max(int(self.cooldown - elapsed), 1))},
+        )
+
+    def record_success(self):
+        self.fail_count = 0
+        self.state = "closed"
+
+    def record_failure(self):
+        self.fail_count += 1
+        if self.state == "half_open" or self.fail_count >= self.threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+breaker = CircuitBreaker(threshold=CFG.breaker_threshold, cooldown=CFG.breaker_cooldown)
+
+
+async def iter_content(agent: Agent, query: str):
+    """执行 Agent, 逐个产出非空的文本片段"""
     async for event in agent.arun(query, stream=True):
         # 根据 agno 实际 API 调整
         # 可能的属性: content, delta, type 等
-        if hasattr(event, "content") and event.content:
-            response_parts.append(event.content)
-        elif isinstance(event, str):
-            response_parts.append(event)
+        # 单次 getattr 取代 hasattr + 属性访问; 纯字符串事件用 type() 精确判断
+        content = getattr(event, "content", None) or (event if type(event) is str else None)
+        if content:
+            yield content
+
+
+async def coalesce(
+    pieces,
+    max_chars: int = STREAM_BATCH_CHARS,
+    max_delay: float = STREAM_BATCH_DELAY,
+):
+    """
+    合并短时间内到达的文本片段, 减少 SSE 帧数
+
+    缓冲区非空时最多等待 max_delay 秒, 即使上游暂时没有新片段（如工具调用期间）
+    也会按时发送, 不会把已生成的内容一直压在缓冲区里
+    """
+    loop = asyncio.get_running_loop()
+    it = aiter(pieces)
+    buf: list[str] = []
+    size = 0
+    deadline = 0.0
+    pending = None
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(it))
+
+            if buf:
+                done, _ = await asyncio.wait((pending,), timeout=max(deadline - loop.time(), 0))
+                if not done:
+                    yield "".join(buf)
+                    buf.clear()
+                    size = 0
+                    continue
+
+            try:
+                piece = await pending
+            except StopAsyncIteration:
+                break
+            except Exception:
+                # 上游出错时先把已缓冲的内容发出去
+                if buf:
+                    yield "".join(buf)
+                    buf.clear()
+                raise
+            finally:
+                pending = None
+
+            if not buf:
+                deadline = loop.time() + max_delay
+            buf.append(piece)
+            size += len(piece)
+
+            if size >= max_chars:
+                yield "".join(buf)
+                buf.clear()
+                size = 0
+    finally:
+        if pending is not None:
+            pending.cancel()
+            # 等待取消生效后上游生成器才能被关闭
+            await asyncio.wait((pending,))
+            if not pending.cancelled():
+                pending.exception()
+        # 立即关闭上游生成器, 释放 agno 的上游连接, 不依赖 GC
+        await it.aclose()
+
+    if buf:
+        yield "".join(buf)
+
+
+async def run_agent_sync(agent: Agent, query: str, reservation: Reservation) -> str:
+    """
+    执行 Agent 并收集完整输出（非流式）
+
+    注意: agno 的 Agent.arun() 返回异步生成器
+    需要收集所有 chunk 并合并
+    """
+    buf = io.StringIO()
 
-    result = "".join(response_parts).strip()
+    async with agent_slot(reservation):
+        async for content in iter_content(agent, query):
+            buf.write(content)
+
+    result = buf.getvalue().strip()
     return result if result else "No response generated from agent."
 
 
-async def generate_stream(agent: Agent, query: str, model_name: str):
+async def generate_stream(agent: Agent, query: str, model_name: str, reservation: Reservation):
     """SSE 流式生成器（Phase 2）"""
-    try:
-        async for event in agent.arun(query, stream=True):
-            content = None
-
-            # 提取内容
-            if hasattr(event, "content") and event.content:
-                content = event.content
-            elif isinstance(event, str):
-                content = event
-
-            if content:
-                chunk = {
-                    "id": f"chatcmpl-{int(time.time() * 1000)}",
-                    "object": "chat.completion.chunk",
-                    "created": int(time.time()),
-                    "model": model_name,
-                    "choices": [
-                        {
-                            "index": 0,
-                            "delta": {"content": content},
-                            "finish_reason": None,
-                        }
-                    ],
-                }
-                yield f"data: {json.dumps(chunk)}\n\n"
-                await asyncio.sleep(0.01)  # 防止过快
-
-        # 发送结束信号
-        final_chunk = {
-            "id": f"chatcmpl-{int(time.time() * 1000)}",
-            "object": "chat.completion.chunk",
-            "created": int(time.time()),
-            "model": model_name,
-            "choices": [
-                {
-                    "index": 0,
-                    "delta": {},
-                    "finish_reason": "stop",
+    # 同一次补全的所有 chunk 共用 id 和 created
+    now = time.time()
+
+    # 各 chunk 只有 delta 内容不同, 复用同一个结构, 每次只替换 content
+    delta = {"content": ""}
+    choice = {"index": 0, "delta": delta, "finish_reason": None}
+    chunk = {
+        "id": f"chatcmpl-{int(now * 1000)}",
+        "object": "chat.completion.chunk",
+        "created": int(now),
+        "model": model_name,
+        "choices": [choice],
+    }
+
+    # 整个流式输出期间持有槽位
+    async with agent_slot(reservation):
+        try:
+            async for content in coalesce(iter_content(agent, query)):
+                delta["content"] = content
+                yield _SSE_DATA + orjson.dumps(chunk) + _SSE_END
+
+            breaker.record_success()
+
+            # 发送结束信号
+            choice["delta"] = {}
+            choice["finish_reason"] = "stop"
+            yield _SSE_DATA + orjson.dumps(chunk) + _SSE_END
+            yield _SSE_DONE
+
+        except Exception as e:
+            # 错误处理
+            breaker.record_failure()
+            error_chunk = {
+                "error": {
+                    "message": str(e),
+                    "type": "internal_error",
+                    "code": "agent_execution_failed",
                 }
-            ],
-        }
-        yield f"data: {json.dumps(final_chunk)}\n\n"
-        yield "data: [DONE]\n\n"
-
-    except Exception as e:
-        # 错误处理
-        error_chunk = {
-            "error": {
-                "message": str(e),
-                "type": "internal_error",
-                "code": "agent_execution_failed",
             }
-        }
-        yield f"data: {json.dumps(error_chunk)}\n\n"
+            yield _SSE_DATA + orjson.dumps(error_chunk) + _SSE_END
 
 
 # ===== API 端点 =====
@@ -220,35 +516,18 @@ async def generate_stream(agent: Agent, query: str, model_name: str):
 @app.get("/health")
 async def health_check():
     """健康检查"""
-    return {"status": "ok", "service": "githubhunt-api", "version": "1.0.0"}
+    return Response(content=_HEALTH_JSON, media_type="application/json")
 
 
-@app.get("/v1/models", response_model=ModelsResponse)
+@app.get("/v1/models")
 async def list_models():
     """列出可用模型（OpenAI 兼容）"""
-    model_id = config["app"].get("deepseek_model", "deepseek-chat")
-    return ModelsResponse(
-        object="list",
-        data=[
-            ModelInfo(
-                id="githubhunt-agent",
-                object="model",
-                created=int(time.time()),
-                owned_by="githubhunt",
-            ),
-            ModelInfo(
-                id=model_id,
-                object="model",
-                created=int(time.time()),
-                owned_by="deepseek",
-            ),
-        ],
-    )
+    return Response(content=_MODELS_JSON, media_type="application/json")
 
 
 @app.post("/v1/chat/completions")
 async def chat_completions(
-    request: ChatCompletionRequest,
+    raw_request: Request,
     authorization: Optional[str] = Header(None),
 ):
     """
@@ -258,6 +537,12 @@ async def chat_completions(
     # 鉴权
     await verify_api_key(authorization)
 
+    # 解析请求体
+    try:
+        request = _request_decoder.decode(await raw_request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
+
     # 提取 query
     try:
         query = messages_to_query(request.messages)
@@ -266,36 +551,65 @@ async def chat_completions(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to parse messages: {str(e)}")
 
-    # 创建 Agent
-    agent = create_agent()
-
-    # 流式响应
-    if request.stream:
-        return StreamingResponse(
-            generate_stream(agent, query, request.model),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",  # 禁用 nginx 缓冲
-            },
-        )
+    # 仅对缺省/null 取默认值, 显式的 0 交给下面的校验
+    n = 1 if request.n is None else request.n
+    if n < 1:
+        raise HTTPException(status_code=400, detail="n must be at least 1")
+
+    if n > CFG.max_n:
+        raise HTTPException(status_code=400, detail=f"n must be at most {CFG.max_n}")
+
+    if request.stream and n > 1:
+        raise HTTPException(status_code=400, detail="Streaming with n > 1 is not supported")
+
+    # 准入控制: 鉴权和解析不占用槽位, 只限制 Agent 执行
+    reservation = check_admission(n)
 
-    # 非流式响应
     try:
-        response_text = await run_agent_sync(agent, query)
+        # 熔断期间快速失败
+        breaker.check()
+
+        # 获取 Agent
+        agent = get_agent(False)
+
+        # 流式响应: 名额交由响应对象在结束时归还
+        if request.stream:
+            return ReservedStreamingResponse(
+                generate_stream(agent, query, request.model, reservation),
+                reservation=reservation,
+                media_type="text/event-stream",
+                headers={
+                    "Cache-Control": "no-cache",
+                    "Connection": "keep-alive",
+                    "X-Accel-Buffering": "no",  # 禁用 nginx 缓冲
+                },
+            )
+    except BaseException:
+        reservation.release()
+        raise
 
-        return {
-            "id": f"chatcmpl-{int(time.time() * 1000)}",
+    # 非流式响应
+    try:
+        # n > 1 时并发执行多个 Agent, 总耗时约等于单次耗时;
+        # 任一执行失败时 TaskGroup 会取消其余执行, 不再继续消耗槽位和 token
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(run_agent_sync(agent, query, reservation)) for _ in range(n)]
+        results = [task.result() for task in tasks]
+        breaker.record_success()
+
+        now = time.time()
+        body = {
+            "id": f"chatcmpl-{int(now * 1000)}",
             "object": "chat.completion",
-            "created": int(time.time()),
+            "created": int(now),
             "model": request.model,
             "choices": [
                 {
-                    "index": 0,
+                    "index": i,
                     "message": {"role": "assistant", "content": response_text},
                     "finish_reason": "stop",
                 }
+                for i, response_text in enumerate(results)
             ],
             "usage": {
                 "prompt_tokens": 0,  # agno 可能不提供，暂时填 0
@@ -303,23 +617,31 @@ async def chat_completions(
                 "total_tokens": 0,
             },
         }
+        # 直接返回 orjson 序列化结果, 跳过 FastAPI 的 jsonable_encoder
+        return Response(content=orjson.dumps(body), media_type="application/json")
 
     except Exception as e:
+        # 熔断器按请求记录结果: n 次执行中任一失败即整体记为一次失败
+        breaker.record_failure()
+        if isinstance(e, ExceptionGroup):
+            e = e.exceptions[0]
         raise HTTPException(status_code=500, detail=f"Agent execution failed: {str(e)}")
 
+    finally:
+        # 归还未被 agent_slot 消耗的名额（执行失败或请求被取消时）
+        reservation.release()
+
 
 # ===== 启动配置 =====
 
 if __name__ == "__main__":
     import uvicorn
 
-    host = config.get("api", {}).get("host", "0.0.0.0")
-    port = config.get("api", {}).get("port", 7777)
-
     uvicorn.run(
         "api_server:app",
-        host=host,
-        port=port,
-        reload=True,
+        host=CFG.host,
+        port=CFG.port,
+        workers=CFG.workers,
+        reload=CFG.reload,  # 开启 reload 时 workers 不生效
         log_level="info",
     )
@@ -8,10 +8,20 @@ export PATH="$HOME/.local/bin:$PATH"
 # 默认配置
 HOST="${API_HOST:-0.0.0.0}"
 PORT="${API_PORT:-7777}"
+WORKERS="${API_WORKERS:-$(nproc 2>/dev/null || sysctl -n hw.ncpu 2>/dev/null || echo 1)}"
 
 echo "Starting GitHubHunt API Server..."
 echo "Host: $HOST"
 echo "Port: $PORT"
+
+# 热重载仅用于开发环境: API_RELOAD=1 ./run_api.sh
+if [ -n "$API_RELOAD" ]; then
+    echo "Reload: on"
+    echo ""
+    exec uv run uvicorn api_server:app --host "$HOST" --port "$PORT" --reload
+fi
+
+echo "Workers: $WORKERS"
 echo ""
 
-uv run uvicorn api_server:app --host "$HOST" --port "$PORT" --reload
+exec uv run uvicorn api_server:app --host "$HOST" --port "$PORT" --workers "$WORKERS"